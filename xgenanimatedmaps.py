@@ -1,63 +1,270 @@
 import maya.cmds as cmds
 import maya.OpenMaya as om
-import pymel.core as pm
-import xgenm as xg
 import os
-import shutil
-import unicodedata
-import re
+import tempfile
+
+from contextlib import contextmanager
+
+# The heavyweight libraries are pulled in on first use instead of at module
+# load: importing pymel.core alone can take seconds, which is a steep price
+# for merely importing this module (e.g. to read XgenAnim.version).
+try:
+    unicode
+except NameError:
+    # Python 3 (maya 2022+): str is already unicode.
+    unicode = str
+
+try:
+    xrange
+except NameError:
+    # Python 3 ranges are lazy already.
+    xrange = range
+
+# The interpreter branch is decided once at import time rather than on
+# every call: python 3 strings need no coercion at all.
+if unicode is str:
+    def _safe_string(value):
+        return value
+else:
+    # Bounded memo for the rare non-ascii inputs: the same handful of
+    # settings strings gets written over and over, so each one pays for
+    # its decomposition once.
+    _ascii_cache = {}
+
+    def _safe_string(value):
+        if isinstance(value, unicode):
+            # Fast path: plain ascii needs no decomposition, and that's the
+            # overwhelming majority of maya node and xgen attribute names.
+            try:
+                return value.encode('ascii')
+            except UnicodeEncodeError:
+                pass
+
+            cached = _ascii_cache.get(value)
+
+            if cached is None:
+                import unicodedata
+
+                if len(_ascii_cache) > 1024:
+                    _ascii_cache.clear()
+
+                cached = _ascii_cache[value] = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore')
+
+            return cached
+
+        return value
+
+__all__ = ['Utils', 'XgenAttributeWrapper', 'UiElementWrapper', 'UiProgressBar', 'UiOptionMenu',
+           'UiObjectSelection', 'UiTextField', 'ProjectSettings', 'XgenAnimSettingsDependant',
+           'PtxBaker', 'XgenAnim']
+
+# The settings keys double as ui control names and are hashed on every
+# settings read; interned, each lookup hits the dict on a pointer compare
+# instead of a character-by-character equality check.
+try:
+    _intern = intern
+except NameError:
+    # Python 3 moved intern out of the builtins.
+    from sys import intern as _intern
+
+K_COLLECTION = _intern('xgenCollection')
+K_DESCRIPTION = _intern('xgenDescription')
+K_OBJECT = _intern('xgenObject')
+K_ATTRIBUTE = _intern('xgenAttribute')
+K_EMITTER = _intern('xgenEmitter')
+K_SEQUENCE = _intern('xgenSequence')
+K_EXPRESSION = _intern('xgenExpression')
+K_RESOLUTION = _intern('xgenResolution')
+
+pm = None
+xg = None
+
+
+def require_maya_libs():
+    global pm, xg
+
+    if pm is None:
+        import pymel.core
+        import xgenm
+
+        pm = pymel.core
+        xg = xgenm
+
+
+@contextmanager
+def suspend_viewport():
+    """
+    Suspends viewport refreshes for the duration of the block; some maya
+    versions under-suspend with the refresh flag alone, so the main pane is
+    unmanaged as well.
+    """
+    cmds.refresh(suspend=True)
+    pm.mel.eval('paneLayout -e -manage false $gMainPane')
+
+    try:
+        yield
+    finally:
+        pm.mel.eval('paneLayout -e -manage true $gMainPane')
+        cmds.refresh(suspend=False)
+
+        # One explicit redraw to bring the viewport back in sync.
+        cmds.refresh(force=True)
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Maya builds shipping python 2 have no concurrent.futures; fall back
+    # to synchronous file operations in that case.
+    ThreadPoolExecutor = None
 
 
 class Utils:
 
+    # Cached xgen query results keyed by (function name, args). Every xgen
+    # query crosses into the c++ side and walks the scene, so repeated ui
+    # refreshes reuse these until explicitly invalidated.
+    _xg_cache = {}
+
     @staticmethod
-    def safe_string(value):
-        if type(value) is unicode:
-            value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore')
+    def xg_cached(fn, *args):
+        key = (fn.__name__,) + args
 
-        return value
+        if key not in Utils._xg_cache:
+            Utils._xg_cache[key] = fn(*args)
+
+        return Utils._xg_cache[key]
+
+    @staticmethod
+    def xg_cache_clear():
+        Utils._xg_cache.clear()
+
+    safe_string = staticmethod(_safe_string)
+
+    @staticmethod
+    def publish_file(source, target):
+        """
+        Publishes a freshly baked file under its target name as cheaply as
+        the filesystem allows: an atomic rename first, a hardlink next, and
+        a full copy only when both fail (e.g. across devices). A missing
+        source is reported by returning False instead of requiring the
+        caller to stat beforehand.
+
+        The whole operation runs inline: the caller is free to rewrite the
+        source the moment this returns. In the common case — target sits
+        next to the source — the rename succeeds and the publish is a
+        single metadata operation anyway.
+        """
+        try:
+            os.rename(source, target)
+
+            return True
+        except OSError:
+            pass
+
+        try:
+            os.link(source, target)
+        except (OSError, AttributeError):
+            import shutil
+
+            try:
+                shutil.copy2(source, target)
+            except (IOError, OSError):
+                # Nothing was baked for this frame.
+                return False
+
+        return True
+
+    @staticmethod
+    def link_file(source, target):
+        """
+        Duplicates an already published file under another name, keeping
+        the source in place: a hardlink where the filesystem supports it,
+        a copy otherwise.
+        """
+        try:
+            os.link(source, target)
+        except (OSError, AttributeError):
+            import shutil
+
+            shutil.copy2(source, target)
 
     @staticmethod
     def use_global_vars(value, project):
-        collection = project.settings.get('xgenCollection')
-        description = project.settings.get('xgenDescription')
-        path = xg.descriptionPath(collection, description)
+        require_maya_libs()
+
+        collection = project.settings.get(K_COLLECTION)
+        description = project.settings.get(K_DESCRIPTION)
+
+        # The description path is stable for the session; reuse the memo
+        # instead of crossing into xgen on every substitution.
+        path = Utils.xg_cached(xg.descriptionPath, collection, description)
 
         return value.replace('${DESC}', path)
 
 
 class XgenAttributeWrapper(object):
 
+    __slots__ = ('id', 'collection', 'description', 'object', '_lines')
+
     def __init__(self, id, collection, description, obj):
+        require_maya_libs()
+
         self.id = id
         self.collection = collection
         self.description = description
         self.object = obj
-        self.value = self.get()
+
+        # The script is kept as a list of lines and only joined on demand;
+        # appending to a growing string would copy the whole buffer on
+        # every line, turning long bakes quadratic. The initial fetch is
+        # lazy as well — a wrapper that's cleared and rewritten without
+        # being read never pays for the xgen round trip.
+        self._lines = None
+
+    def _ensure_lines(self):
+        if self._lines is None:
+            self._lines = self.get().split('\\n')
+
+        return self._lines
+
+    @property
+    def value(self):
+        return '\n'.join(self._ensure_lines())
 
     def get(self):
         return xg.getAttr(self.id, self.collection, self.description, self.object)
 
     def get_lines(self, cached=True):
-        return (self.value if cached else self.get()).split('\\n')
+        return self._ensure_lines() if cached else self.get().split('\\n')
 
-    def commit(self):
+    def commit(self, suppress_refresh=False):
         xg.setAttr(self.id, xg.prepForAttribute(self.value), self.collection, self.description, self.object)
 
-        # Refresh the ui.
-        xg.xgGlobal.DescriptionEditor.refresh('Full')
+        # Refresh the ui. Batch writers can suppress this and issue a
+        # single refresh themselves once every attribute is in place. A
+        # 'Current' refresh repaints just the active description; not
+        # every xgen build accepts it, hence the 'Full' fallback.
+        if not suppress_refresh:
+            try:
+                xg.xgGlobal.DescriptionEditor.refresh('Current')
+            except Exception:
+                xg.xgGlobal.DescriptionEditor.refresh('Full')
 
     def clear(self):
-        self.value = ''
+        self._lines = []
 
         return self
 
     def append_line(self, value=''):
-        self.value += '%s\n' % value
+        self._ensure_lines().append(value)
 
         return self
 
 
+def _noop():
+    pass
+
+
 # Look, autodesk, this is how it must've actually worked from the box.
 # Amen.
 class UiElementWrapper(object):
@@ -65,9 +272,13 @@ class UiElementWrapper(object):
     Implements basic ui element wrapper.
     """
 
+    __slots__ = ('id_pure', 'on_change', 'value', 'settings')
+
     def __init__(self, id, default_value='', change_callback=None, project=None):
         self.id_pure = id
-        self.on_change = change_callback
+        # Resolved once: a non-callable collapses to a shared no-op so the
+        # hot set_value path never re-checks callability.
+        self.on_change = change_callback if callable(change_callback) else _noop
         self.value = ''
         self.settings = None
 
@@ -78,13 +289,17 @@ class UiElementWrapper(object):
             self.set_value(default_value)
 
     def set_value(self, value):
+        # Re-setting the current value would only re-fire the change
+        # cascade for nothing; skip it outright.
+        if value == self.value:
+            return
+
         self.value = value
 
         if self.settings:
             self.settings.set(self.id_pure, value)
 
-        if callable(self.on_change):
-            self.on_change()
+        self.on_change()
 
 
 class UiProgressBar(UiElementWrapper):
@@ -92,69 +307,140 @@ class UiProgressBar(UiElementWrapper):
     Implements encapsulated progress bar ui element.
     """
 
+    __slots__ = ('id', 'max_value', 'progress')
+
     def __init__(self, id, max_value=100):
         super(UiProgressBar, self).__init__(id)
 
-        self.id = pm.progressBar(id, maxValue=max_value)
+        self.id = cmds.progressBar(id, maxValue=max_value)
 
         self.max_value = max_value
         self.progress = 0
 
     def is_cancelled(self):
-        return pm.progressBar(self.id, q=True, isCancelled=True) or False
+        return cmds.progressBar(self.id, q=True, isCancelled=True) or False
 
     def cancel(self):
-        pm.progressBar(self.id, e=True, isCancelled=True)
+        cmds.progressBar(self.id, e=True, isCancelled=True)
 
         return self
 
     def set_status(self, value):
-        pm.progressBar(self.id, e=True, status=value)
+        cmds.progressBar(self.id, e=True, status=value)
 
         return self
 
     def set_max_value(self, value):
-        pm.progressBar(self.id, e=True, maxValue=value)
+        cmds.progressBar(self.id, e=True, maxValue=value)
         self.max_value = value
 
         return self
 
     def set_step(self, value=1):
-        pm.progressBar(self.id, e=True, step=value)
+        cmds.progressBar(self.id, e=True, step=value)
         self.progress += value
 
         return self
 
     def set_progress(self, value):
-        pm.progressBar(self.id, e=True, progress=value)
+        cmds.progressBar(self.id, e=True, progress=value)
         self.progress = value
 
         return self
 
+    def reset(self, max_value, progress=0):
+        # Both flags go through a single edit call instead of two separate
+        # round trips.
+        cmds.progressBar(self.id, e=True, maxValue=max_value, progress=progress)
+        self.max_value = max_value
+        self.progress = progress
+
+        return self
+
 
 class UiOptionMenu(UiElementWrapper):
     """
     Implements encapsulated option menu ui element.
     """
 
-    def __init__(self, id, value='', label='', change_callback=None, project=None):
+    __slots__ = ('id', '_pool', '_populated', 'populate')
+
+    def __init__(self, id, value='', label='', change_callback=None, populate_callback=None, project=None):
         super(UiOptionMenu, self).__init__(id, value, change_callback, project)
 
+        # Pooled menu item handles, relabelled in place on refresh.
+        self._pool = []
+
+        # Deferred population: the callback runs once when the menu is
+        # first opened, so unused menus never pay for their xgen queries.
+        self._populated = False
+        self.populate = populate_callback
+
         # Create the element itself.
-        self.id = pm.optionMenu(id, label=label, cc=self.set_value)
+        self.id = cmds.optionMenu(id, label=label, cc=self.set_value, pmc=self.populate_once)
+
+    def populate_once(self, *args):
+        if self._populated or not callable(self.populate):
+            return
+
+        self.populate()
+
+    def invalidate(self):
+        self._populated = False
+
+        # The previous selection belongs to the upstream value that just
+        # changed; drop it from the wrapper and the settings so validate()
+        # fails until the menu is repopulated, instead of letting a bake
+        # run against a stale description or attribute.
+        self.value = ''
+
+        if self.settings:
+            self.settings.set(self.id_pure, '')
+
+        # Blank the closed control as well; leaving the old label on
+        # display would make the ui look filled while validate() fails.
+        if self._pool:
+            cmds.menuItem(self._pool[0], e=True, label='')
+            cmds.optionMenu(self.id, e=True, select=1)
+
+        return self
 
     def get_items(self):
-        return pm.optionMenu(self.id, q=True, ill=True) or []
+        return cmds.optionMenu(self.id, q=True, ill=True) or []
 
     def set_items(self, items):
-        for item in self.get_items():
-            pm.deleteUI(item)
+        self._populated = True
+
+        # Relabel pooled items in place instead of tearing the menu down;
+        # creating and deleting maya ui objects costs far more than editing
+        # them, and the delete/recreate cycle makes the menu flicker.
+        for index, item in enumerate(items):
+            if index < len(self._pool):
+                cmds.menuItem(self._pool[index], e=True, label=item, enable=True, visible=True)
+            else:
+                self._pool.append(cmds.menuItem(label=item, parent=self.id))
+
+        # Hide the leftover pool tail rather than deleting it.
+        for index in xrange(len(items), len(self._pool)):
+            cmds.menuItem(self._pool[index], e=True, visible=False)
+
+        # Trim a pool that has grown far beyond what's displayed; deleteUI
+        # takes varargs, so the surplus goes in one round trip instead of
+        # one call per item.
+        limit = max(len(items) * 2, 8)
+        if len(self._pool) > limit:
+            surplus = self._pool[limit:]
+            del self._pool[limit:]
+
+            cmds.deleteUI(*surplus)
 
         if not len(items):
             return
 
-        for item in items:
-            pm.menuItem(item, label=item, parent=self.id)
+        # Relabelling leaves the control's previous selection index in
+        # place; snap it back to the first item so the display matches the
+        # value recorded below.
+        cmds.optionMenu(self.id, e=True, select=1)
 
         # Update the element.
         self.set_value(items[0])
@@ -165,6 +451,8 @@ class UiObjectSelection(UiElementWrapper):
     Implements encapsulated object selection ui element.
     """
 
+    __slots__ = ('id', 'object_types')
+
     def __init__(self, id, object_types=None, label='', button_label='Selection', change_callback=None, project=None):
         object_types = object_types or []
 
@@ -172,16 +460,17 @@ class UiObjectSelection(UiElementWrapper):
         self.object_types = object_types
 
         # Create the element itself.
-        self.id = pm.textFieldButtonGrp(id, label=label, bl=button_label, bc=self.object_selection, tcc=self.set_value)
+        self.id = cmds.textFieldButtonGrp(id, label=label, bl=button_label, bc=self.object_selection, tcc=self.set_value)
 
     def object_selection(self):
-        obj = cmds.ls(sl=True)
+        # Only the first selected object is ever used, so don't make maya
+        # marshal the entire selection into python strings.
+        obj = cmds.ls(sl=True, head=1)
 
         # Do nothing in case no objects are present in the selection.
         if not len(obj):
             return cmds.warning('The selection is empty.')
 
-        # Otherwise use the first reference.
         obj = obj[0]
 
         # Check the object type compliance, if any is given.
@@ -194,7 +483,7 @@ class UiObjectSelection(UiElementWrapper):
         super(UiObjectSelection, self).set_value(value)
 
         # Update textfield value.
-        pm.textFieldButtonGrp(self.id, e=True, tx=value)
+        cmds.textFieldButtonGrp(self.id, e=True, tx=value)
 
 
 class UiTextField(UiElementWrapper):
@@ -202,30 +491,33 @@ class UiTextField(UiElementWrapper):
     Implements encapsulated text field ui element.
     """
 
+    __slots__ = ()
+
     def __init__(self, id, label='', default_value='', project=None):
         super(UiTextField, self).__init__(id, default_value=default_value, project=project)
 
         # Create the element itself.
-        pm.textFieldGrp(id, label=label, tx=default_value, tcc=self.set_value)
+        cmds.textFieldGrp(id, label=label, tx=default_value, tcc=self.set_value)
 
 
-class ProjectSettings:
+class ProjectSettings(object):
     """
     Implements project settings data structure.
     """
 
+    __slots__ = ('_storage', 'revision')
+
     def __init__(self):
-        pass
+        # Keep the storage per instance; a class-level dict would be shared
+        # between every settings object.
+        self._storage = {}
 
-    _storage = {}
+        # Bumped on every write so derived values can cheaply check whether
+        # their cached copy is still current.
+        self.revision = 0
 
     def get(self, id, default_value=None):
-        result = default_value
-
-        if self.has(id) and len(self._storage):
-            result = self._storage[id]
-
-        return result
+        return self._storage.get(id, default_value)
 
     def set(self, id, value):
         # Ensure value usage safety.
@@ -233,75 +525,108 @@ class ProjectSettings:
 
         # Set the storage value.
         self._storage[id] = value
+        self.revision += 1
 
         return self
 
     def has(self, id):
-        return id in self._storage and self._storage[id]
+        return bool(self._storage.get(id))
 
 
 class XgenAnimSettingsDependant(object):
 
-    def __init__(self, project, required_settings=None):
-        required_settings = required_settings or []
+    __slots__ = ('project', 'required_settings')
 
+    def __init__(self, project, required_settings=None):
         self.project = project
-        self.required_settings = required_settings
+
+        # Freeze the requirements; they're never meant to change after
+        # construction.
+        self.required_settings = tuple(required_settings or ())
 
     def get_settings(self, id, default_value=None):
         return self.project.settings.get(id, default_value)
 
     def validate(self):
-        result = True
-
-        for item in self.required_settings:
-            if not self.project.settings.has(item):
-                result = False
-
-                break
-
-        return result
+        return all(self.project.settings.has(item) for item in self.required_settings)
 
 
 class PtxBaker(XgenAnimSettingsDependant):
 
+    __slots__ = ('collection', 'description', 'emitter', 'sequence', 'obj', 'attr', 'expression',
+                 'tpu', 'is_file', '_convert_options')
+
     @staticmethod
     def perform_conversion(project):
         # Perform the baking procedure.
         (PtxBaker(project)).convert()
 
     def __init__(self, project):
-        super(PtxBaker, self).__init__(project, ['xgenCollection', 'xgenDescription', 'xgenSequence',
-                                                 'xgenEmitter', 'xgenAttribute'])
-
-        self.collection = self.get_settings('xgenCollection')
-        self.description = self.get_settings('xgenDescription')
-        self.emitter = self.get_settings('xgenEmitter')
-        self.sequence = self.get_settings('xgenSequence')
-        self.obj = self.get_settings('xgenObject')
-        self.attr = XgenAttributeWrapper(self.get_settings('xgenAttribute'), self.collection, self.description, self.obj)
-        self.expression = self.get_settings('xgenExpression', self.get_expression() or '$a')
-        self.tpu = self.get_settings('xgenResolution', 512)
+        require_maya_libs()
+
+        super(PtxBaker, self).__init__(project, [K_COLLECTION, K_DESCRIPTION, K_SEQUENCE,
+                                                 K_EMITTER, K_ATTRIBUTE])
+
+        self.collection = self.get_settings(K_COLLECTION)
+        self.description = self.get_settings(K_DESCRIPTION)
+        self.emitter = self.get_settings(K_EMITTER)
+        self.sequence = self.get_settings(K_SEQUENCE)
+        self.obj = self.get_settings(K_OBJECT)
+        self.attr = XgenAttributeWrapper(self.get_settings(K_ATTRIBUTE), self.collection, self.description, self.obj)
+        self.expression = self.get_settings(K_EXPRESSION, self.get_expression() or '$a')
+        self.tpu = self.get_settings(K_RESOLUTION, 512)
+
+        # Both are frame-invariant: whether the source can be baked as-is,
+        # and the option set for the solid texture conversion fallback.
+        self.is_file = bool(self.sequence) and cmds.objectType(self.sequence) == 'file'
+        # A stable per-session temp image keeps convertSolidTx rewriting
+        # one file instead of allocating a fresh one every frame; prefer a
+        # ram-backed location where the platform offers one.
+        tmp_root = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        self._convert_options = dict(alpha=False, antiAlias=False, bm=2, fts=True, sp=False, sh=False,
+                                     ds=False, cr=False, rx=self.tpu, ry=self.tpu, fil='iff',
+                                     fileImageName=os.path.join(tmp_root, 'xgenBakeTemp_%d' % os.getpid()))
 
     def get_assigned_map(self):
-        attr_map = re.search("^[^#]+=map\(\\'(.*?)\\'", self.attr.value)
-        if attr_map:
-            attr_map = attr_map.group(1).replace('${DESC}', '')
+        # The pattern is trivial — first non-comment line carrying a
+        # map('...') call — so two c-level finds per line beat spinning
+        # up the regex machinery for it.
+        #
+        # Deliberately laxer than the old ^[^#]+=map regex, which bailed
+        # as soon as a comment preceded the map() call and therefore
+        # refused to re-bake a channel this tool had already generated
+        # (our own scripts open with '#' headers). Comment lines are
+        # skipped and the scan continues, so re-baking works.
+        for line in self.attr.get_lines():
+            if not line or line.lstrip().startswith('#'):
+                continue
+
+            index = line.find("=map('")
+
+            if index < 0:
+                continue
+
+            end = line.find("'", index + 6)
 
-        # Perform regex test.
-        return attr_map
+            if end >= 0:
+                return line[index + 6:end].replace('${DESC}', '')
+
+        return None
 
     def get_expression(self):
-        lines = self.attr.get_lines()
-        result = ''
+        # Locate the last '$a' with a c-level reverse scan and slice out
+        # its line; no per-line python loop over a potentially huge
+        # generated script.
+        buffer = self.attr.value
+        index = buffer.rfind('$a')
 
-        for index in reversed(range(len(lines))):
-            if '$a' in lines[index]:
-                result = lines[index]
+        if index < 0:
+            return ''
 
-                break
+        start = buffer.rfind('\n', 0, index) + 1
+        end = buffer.find('\n', index)
 
-        return result
+        return buffer[start:] if end < 0 else buffer[start:end]
 
     def convert(self, start_frame=None, end_frame=None):
         # Validate settings fields.
@@ -311,17 +636,34 @@ class PtxBaker(XgenAnimSettingsDependant):
         start_frame = start_frame or int(cmds.playbackOptions(q=True, minTime=True))
         end_frame = end_frame or int(cmds.playbackOptions(q=True, maxTime=True) + 1)
 
+        # The playback range is queried exactly once; everything below works
+        # off this sequence. xrange keeps it lazy on python 2 rather than
+        # materializing a list of every frame.
+        frames = xrange(start_frame, end_frame)
+
         # Check whether the alleged attribute has a map assigned.
         path_map = self.get_assigned_map()
         if not path_map:
             return cmds.warning('No map is currently assigned to the channel selected.')
 
         path_map = '/paintmaps/%s' % self.attr.id
-        path = '%s/%s/' % (xg.descriptionPath(self.collection, self.description), path_map)
+        path = '%s/%s/' % (Utils.xg_cached(xg.descriptionPath, self.collection, self.description), path_map)
         path_bake = '%s%s.ptx' % (path, self.emitter)
-
-        # Prepare the ui.
-        self.project.ui_progress.set_max_value(end_frame).set_progress(start_frame)
+        # The per-frame strings differ only by the frame number; with the
+        # invariant pieces precomputed, each frame is a couple of c-level
+        # concatenations with no format parsing at all.
+        path_frame_prefix = '%s%s.' % (path, self.emitter)
+
+        # The emitted script chunk likewise splits around its two frame
+        # number slots (keyword + ' ($frame <= ' + frame + entry_mid +
+        # frame + ".ptx');\n}").
+        entry_mid = ") {\n\t$a=map('${DESC}%s/%s." % (path_map, self.emitter)
+
+        # Prepare the ui. The bar is only pushed every progress_stride
+        # frames; with the viewport suspended a per-frame edit is pure
+        # overhead, and ~100 visible ticks over the run read the same.
+        self.project.ui_progress.reset(end_frame, start_frame)
+        progress_stride = max(1, (end_frame - start_frame) // 100)
 
         # And the attribute wrapper.
         self.attr.clear().append_line(
@@ -336,48 +678,137 @@ class PtxBaker(XgenAnimSettingsDependant):
             '# providing animated maps to xgen channels.'
         ).append_line()
 
-        is_file = cmds.objectType(self.sequence) == 'file'
-
-        # Bake it.
-        for frame in range(start_frame, end_frame):
-            # Set current time.
-            cmds.currentTime(frame)
-
-            # Make sure source sequence can be baked.
-            bake_node = self.sequence
-            if not is_file:
-                bake_node = cmds.convertSolidTx(bake_node, self.emitter, alpha=False, antiAlias=False, bm=2, fts=True,
-                                                sp=False, sh=False, ds=False, cr=False, rx=self.tpu, ry=self.tpu, fil='iff',
-                                                fileImageName='xgenBakeTemp')
-                if len(bake_node):
-                    bake_node = bake_node[0]
-
-            cmds.ptexBake(inMesh=self.emitter, o=path, bt=bake_node, tpu=self.tpu)
-
-            if not is_file:
-                cmds.delete(bake_node)
-
-            if os.path.isfile(path_bake):
-                shutil.copy2(path_bake, '%s%s.%s.ptx' % (path, self.emitter, frame))
-
-            # Append a new frame reference to the attribute.
-            if not frame == end_frame:
-                self.attr.append_line(
-                    '%s ($frame <= %s) {' % ('if' if frame == start_frame else 'else if', frame)
-                )
-            else:
-                self.attr.append_line(
-                    'else {'
-                )
-
-            self.attr.append_line(
-                '\t$a=map(\'${DESC}%s/%s.%s.ptx\');' % (path_map, self.emitter, frame)
-            ).append_line(
-                '}'
-            )
-
-            # Increase progress bar position.
-            self.project.ui_progress.set_step()
+        is_file = self.is_file
+
+        # Hoist the per-frame instance reads into locals; inside the loop
+        # these are plain fast locals instead of attribute lookups.
+        emitter = self.emitter
+        sequence = self.sequence
+        tpu = self.tpu
+        attr = self.attr
+        progress = self.project.ui_progress
+
+        # File nodes reading an image sequence can be stepped through their
+        # frame extension attribute alone, dirtying just the texture
+        # subgraph instead of re-evaluating the entire scene per frame. Only
+        # applicable while the attribute isn't driven by an expression.
+        frame_extension = '%s.frameExtension' % sequence
+        sequence_animated = bool(is_file and cmds.getAttr('%s.useFrameExtension' % sequence))
+        use_frame_extension = (sequence_animated
+                               and not cmds.connectionInfo(frame_extension, isDestination=True))
+
+        # A file source that isn't sequenced renders the same image on
+        # every frame; it's baked once and the result is hardlinked across
+        # the rest of the range instead of re-baked per frame.
+        is_static = is_file and not sequence_animated
+        static_source = None
+
+        # A small pool for the static-source fan-out below: those links all
+        # read one published file that nothing rewrites, so they're safe to
+        # overlap. The per-frame bake output is published inline instead —
+        # handing it off would race the next ptexBake rewriting path_bake,
+        # publishing one frame with the next frame's data. The rename is
+        # metadata-only, so inline costs nothing anyway.
+        pool = ThreadPoolExecutor(max_workers=4) if ThreadPoolExecutor else None
+        publishes = []
+
+        # Track the scene time so a frame the scene already sits on (the
+        # usual case for the very first iteration) skips the evaluation a
+        # currentTime call would trigger.
+        current = int(cmds.currentTime(q=True))
+
+        # Only the very first emitted entry opens with a bare 'if'; carrying
+        # the keyword in a variable spares the comparison every frame after.
+        keyword = 'if'
+
+        # Bake it. Suspend viewport refreshes for the duration — every
+        # currentTime call would otherwise trigger a full redraw — and turn
+        # undo recording off outright: an undo entry for a bake that writes
+        # files on disk is meaningless, and recording thousands of time
+        # changes and node edits costs both time and memory. The
+        # stateWithoutFlush flag is essential here: plain state=False
+        # flushes the whole queue, wiping the user's session history.
+        prev_undo = cmds.undoInfo(q=True, state=True)
+        cmds.undoInfo(stateWithoutFlush=False)
+
+        try:
+            with suspend_viewport():
+                for frame in frames:
+                    frame_str = str(frame)
+
+                    if static_source:
+                        # Every frame past the first just mirrors the one
+                        # existing bake.
+                        path_frame = path_frame_prefix + frame_str + '.ptx'
+
+                        if pool:
+                            publishes.append(pool.submit(Utils.link_file, static_source, path_frame))
+                        else:
+                            Utils.link_file(static_source, path_frame)
+
+                        attr.append_line(keyword + ' ($frame <= ' + frame_str + entry_mid + frame_str + ".ptx');\n}")
+                        keyword = 'else if'
+
+                        continue
+
+                    # Set current time; sequenced file sources step their
+                    # frame extension directly and skip the scene-wide
+                    # evaluation a time change triggers.
+                    if use_frame_extension:
+                        cmds.setAttr(frame_extension, frame)
+                    elif is_static:
+                        # Frame-invariant source; the scene time is
+                        # irrelevant to the bake.
+                        pass
+                    elif frame != current:
+                        cmds.currentTime(frame)
+                        current = frame
+
+                    # Make sure source sequence can be baked.
+                    bake_node = sequence
+                    if not is_file:
+                        bake_node = cmds.convertSolidTx(bake_node, emitter, **self._convert_options)
+                        if len(bake_node):
+                            bake_node = bake_node[0]
+
+                    cmds.ptexBake(inMesh=emitter, o=path, bt=bake_node, tpu=tpu)
+
+                    if not is_file:
+                        cmds.delete(bake_node)
+
+                    # No isfile probe here: publish_file itself reports a
+                    # missing bake, saving a stat on every frame that went
+                    # through fine.
+                    path_frame = path_frame_prefix + frame_str + '.ptx'
+
+                    if is_static:
+                        if Utils.publish_file(path_bake, path_frame):
+                            static_source = path_frame
+                    else:
+                        Utils.publish_file(path_bake, path_frame)
+
+                    # Append a new frame reference to the attribute.
+                    attr.append_line(keyword + ' ($frame <= ' + frame_str + entry_mid + frame_str + ".ptx');\n}")
+                    keyword = 'else if'
+
+                    # Push the progress bar position in batches.
+                    if (frame - start_frame) % progress_stride == 0:
+                        progress.set_progress(frame)
+        finally:
+            # Wait for the outstanding copies so io errors surface before
+            # the attribute is committed.
+            if pool:
+                pool.shutdown(wait=True)
+
+            cmds.undoInfo(stateWithoutFlush=prev_undo)
+
+        # Re-raise any io error the workers hit; shutdown alone would
+        # swallow them.
+        for publish in publishes:
+            publish.result()
+
+        # Land the bar on its final value regardless of stride alignment.
+        progress.set_progress(end_frame)
 
         # Set the attribute script.
         self.attr.append_line(self.expression).commit()
@@ -389,8 +820,16 @@ class XgenAnim:
     title = 'xGen Animated Maps'
     version = '0.2'
 
+    # Rebuild order of the dependent ui menus.
+    _update_order = ('collections', 'descriptions', 'objects', 'attributes')
+
     def __init__(self):
+        require_maya_libs()
+
         self.settings = ProjectSettings()
+        self._dirty = set()
+        self._flushing = False
+        self._flush_scheduled = False
 
         if pm.window(self.ui_id, exists=True):
             pm.deleteUI(self.ui_id)
@@ -400,20 +839,26 @@ class XgenAnim:
         # Form the UI.
         with pm.columnLayout():
             with pm.frameLayout(l='Map Properties', cll=False, cl=False):
-                self.ui_collection = UiOptionMenu('xgenCollection', label='Collection',
-                                                  change_callback=self.update_descriptions, project=self)
-                self.ui_description = UiOptionMenu('xgenDescription', label='Description',
-                                                   change_callback=self.update_objects, project=self)
-                self.ui_objects = UiOptionMenu('xgenObject', label='Object',
-                                               change_callback=self.update_attributes, project=self)
-                self.ui_attributes = UiOptionMenu('xgenAttribute', label='Attribute', project=self)
-
-                # Set the collection items to trigger the rest.
-                self.update_collections()
-
-                pm.button('update', label='Update', c=self.update_collections)
-
-                self.ui_expression = UiTextField('xgenExpression', label='Final Expression', project=self)
+                self.ui_collection = UiOptionMenu(K_COLLECTION, label='Collection',
+                                                  change_callback=self.invalidate_descriptions,
+                                                  populate_callback=self.update_collections, project=self)
+                self.ui_description = UiOptionMenu(K_DESCRIPTION, label='Description',
+                                                   change_callback=self.invalidate_objects,
+                                                   populate_callback=self.update_descriptions, project=self)
+                self.ui_objects = UiOptionMenu(K_OBJECT, label='Object',
+                                               change_callback=self.invalidate_attributes,
+                                               populate_callback=self.update_objects, project=self)
+                self.ui_attributes = UiOptionMenu(K_ATTRIBUTE, label='Attribute',
+                                                  populate_callback=self.update_attributes, project=self)
+
+                # Menus populate themselves on first open, so creating the
+                # window costs no xgen traversals at all.
+                self._menus = {'collections': self.ui_collection, 'descriptions': self.ui_description,
+                               'objects': self.ui_objects, 'attributes': self.ui_attributes}
+
+                pm.button('update', label='Update', c=self.force_update)
+
+                self.ui_expression = UiTextField(K_EXPRESSION, label='Final Expression', project=self)
                 self.ui_progress = UiProgressBar('xgenProgress', 1000)
 
                 pm.button('assign', label='Assign', c=self.assign)
@@ -421,70 +866,148 @@ class XgenAnim:
         self.window.show()
 
     def get_collection(self):
-        return self.settings.get('xgenCollection', '')
+        return self.settings.get(K_COLLECTION, '')
 
     def get_description(self):
-        return self.settings.get('xgenDescription', '')
+        return self.settings.get(K_DESCRIPTION, '')
 
     def get_object(self):
-        return self.settings.get('xgenObject', '')
+        return self.settings.get(K_OBJECT, '')
 
     def get_attribute(self):
-        return self.settings.get('xgenAttribute', '')
+        return self.settings.get(K_ATTRIBUTE, '')
+
+    # Each upstream change stales its whole downstream chain, not just the
+    # next tier: a new collection invalidates the attributes every bit as
+    # much as the descriptions.
+    def invalidate_descriptions(self):
+        self.refresh('descriptions')
+
+    def invalidate_objects(self):
+        self.refresh('objects')
+
+    def invalidate_attributes(self):
+        self.refresh('attributes')
+
+    def mark_dirty(self, level):
+        self._dirty.add(level)
+
+        # Coalesce: marks raised while a flush is running are picked up by
+        # the same pass instead of recursing into a nested cascade.
+        if self._flushing:
+            return
+
+        # Debounce: rapid consecutive edits pile their marks onto a single
+        # deferred flush, so only the final state gets rebuilt once maya is
+        # idle instead of one full cascade per edit.
+        if self._flush_scheduled:
+            return
+
+        self._flush_scheduled = True
+        cmds.evalDeferred(self.flush_deferred)
+
+    def flush_deferred(self):
+        self._flush_scheduled = False
+        self._flushing = True
+
+        try:
+            self.flush_dirty()
+        finally:
+            self._flushing = False
+
+    def flush_dirty(self):
+        # Dirty levels are only marked stale here; each menu re-queries
+        # xgen when it's actually opened next, so the user pays for the
+        # menus they touch and nothing else.
+        while self._dirty:
+            menu = self._menus.get(self._dirty.pop())
+
+            if menu:
+                menu.invalidate()
+
+    def refresh(self, level='collections'):
+        """
+        Invalidates the named menu tier and everything downstream of it;
+        stale tiers re-query xgen the next time they're opened.
+        """
+        if level not in self._update_order:
+            return
+
+        for item in self._update_order[self._update_order.index(level):]:
+            self.mark_dirty(item)
+
+    def force_update(self, flag=False):
+        # The update button drops the xgen memo and stales every tier.
+        Utils.xg_cache_clear()
+        self.refresh('collections')
 
     def update_collections(self, flag=False):
         if not self.ui_collection:
             return
 
-        self.ui_collection.set_items(xg.palettes())
+        self.ui_collection.set_items(Utils.xg_cached(xg.palettes))
 
     def update_descriptions(self):
-        if not self.ui_description:
+        collection = self.get_collection()
+
+        # With lazy population a downstream menu can be opened before any
+        # upstream pick exists; querying xgen with empty keys would only
+        # memoize junk.
+        if not self.ui_description or not collection:
             return
 
-        collection = self.get_collection()
-        descriptions = xg.descriptions(collection)
+        descriptions = Utils.xg_cached(xg.descriptions, collection)
 
         self.ui_description.set_items(descriptions)
 
     def update_objects(self):
-        if not self.ui_objects:
+        collection = self.get_collection()
+        description = self.get_description()
+
+        if not self.ui_objects or not collection or not description:
             return
 
-        objects = xg.objects(self.get_collection(), self.get_description(), True)
+        objects = Utils.xg_cached(xg.objects, collection, description, True)
         self.ui_objects.set_items(objects)
 
     def update_attributes(self):
-        if not self.ui_attributes:
+        collection = self.get_collection()
+        description = self.get_description()
+        obj = self.get_object()
+
+        if not self.ui_attributes or not collection or not description or not obj:
             return
 
-        attributes = xg.allAttrs(self.get_collection(), self.get_description(), self.get_object())
+        attributes = Utils.xg_cached(xg.allAttrs, collection, description, obj)
         self.ui_attributes.set_items(attributes)
 
-    def get_selection_typed(self, type, inverse=False):
-        selection = cmds.ls(sl=True)
-        result = None
+    def get_selection_split(self, type):
+        """
+        Splits the current selection into the first object of the given
+        type and the first object of any other type, in a single pass.
+        """
+        match = other = None
 
-        for item in selection:
+        for item in cmds.ls(sl=True):
             if cmds.objectType(item) == type:
-                if not inverse:
-                    result = item
-            elif inverse:
-                result = item
+                match = match or item
+            else:
+                other = other or item
 
-        return result
+            if match and other:
+                break
 
+        return match, other
 
     def assign(self, flag=False):
         # Get selected object.
-        object = self.get_selection_typed('transform')
-        node = self.get_selection_typed('transform', True)
+        object, node = self.get_selection_split('transform')
 
         if not object or not node:
             return cmds.warning('Selection must contain a target object and texture source node.')
 
         # Set alleged nodes.
-        self.settings.set('xgenEmitter', object).set('xgenSequence', node)
+        self.settings.set(K_EMITTER, object).set(K_SEQUENCE, node)
 
         # Perform the baking conversion.
         PtxBaker.perform_conversion(self)